@@ -1,13 +1,19 @@
 import sys
 try:
-    from flask import Flask, request, jsonify
+    from flask import Flask, Response, request
+    from flask.json.provider import DefaultJSONProvider
 except ModuleNotFoundError:
     print("Error: Flask is not installed.\nInstall dependencies with: python -m pip install -r requirements.txt")
     sys.exit(1)
 
+import ast
+import functools
+import json
 import math
-import traceback
+import operator
+import os
 import re
+import string
 
 # Try to import flask_cors (optional)
 try:
@@ -17,8 +23,26 @@ except Exception:
     CORS = None
     _CORS_AVAILABLE = False
 
+# Try to import orjson for faster JSON responses (optional)
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except Exception:
+    orjson = None
+    _ORJSON_AVAILABLE = False
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that parses request bodies with orjson"""
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
 
+# request.get_json() goes through orjson when it is available
+if _ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
 # Enable CORS if available
 if _CORS_AVAILABLE:
     CORS(app, resources={r"/api/*": {"origins": "*"}})
@@ -29,8 +53,13 @@ else:
 # ---------------------------------------------------
 # Custom math functions
 # ---------------------------------------------------
+# Precomputed factorials up to 170! (the largest that fits in a float)
+_FACTORIALS = tuple(math.factorial(i) for i in range(171))
+
 def factorial(n):
     """Custom factorial function"""
+    if isinstance(n, int) and 0 <= n < len(_FACTORIALS):
+        return _FACTORIALS[n]
     if not isinstance(n, int) or n < 0:
         raise ValueError("Factorial only for non-negative integers")
     return math.factorial(n)
@@ -43,6 +72,16 @@ def percentage(x):
     """Convert percentage to decimal"""
     return x / 100.0
 
+# Largest integer power result (in bits) computed for ** (about 5000 digits)
+_MAX_POW_BITS = 16384
+
+def power(base, exp):
+    """Power function for ** with a bound on exact integer results"""
+    if (isinstance(base, int) and isinstance(exp, int) and exp > 0
+            and abs(base) > 1 and exp * abs(base).bit_length() > _MAX_POW_BITS):
+        raise OverflowError("Integer power result too large")
+    return base ** exp
+
 # ---------------------------------------------------
 # Allowed functions for safe evaluation
 # ---------------------------------------------------
@@ -97,45 +136,59 @@ SAFE_ENV = {
     "__builtins__": {}  # block unsafe operations
 }
 
+# ---------------------------------------------------
+# Expression validation tables
+# ---------------------------------------------------
+# str.translate deletes every allowed character; anything left over is invalid
+_VALID_CHARS = string.digits + string.ascii_letters + string.whitespace + "+-*/().^!%_,"
+_DELETE_VALID = {ord(c): None for c in _VALID_CHARS}
+
+# Division by a literal zero (1/0) or by a parenthesised group containing 0
+_DIV_ZERO_RE = re.compile(r'/0(?!\.\d)|/\([^)]*0[^)]*\)')
+_BAD_FACTORIAL_RE = re.compile(r'factorial\(-?\d*\.\d+\)')
+
 # ---------------------------------------------------
 # Expression preprocessing
 # ---------------------------------------------------
+# All rewrites are fused into one alternation so the expression is scanned
+# once. Zero-width implied-multiplication rules come first so they fire
+# before a number is consumed by the modulus/percent/factorial rules, and
+# modulus comes before percent so 10%3 is not read as 10% followed by 3.
+# Modulus is left as a binary % so it keeps Python's operator precedence.
+_PREPROC_RE = re.compile(
+    r'(?P<mul>(?<=[\d)])(?=\()'            # 2(3) -> 2*(3), (2)(3) -> (2)*(3)
+    r'|(?:(?<=\))|(?<=pi)|(?<=e))(?=\d)'    # (2)3 -> (2)*3, pi2 -> pi*2, e2 -> e*2
+    r'|(?<=\d)(?=pi|e))'                    # 2pi -> 2*pi, 2e -> 2*e
+    r'|(?P<mod>\d+(?:\.\d+)?%\d+(?:\.\d+)?)'  # 10%3 stays 10%3
+    r'|(?P<pct>\d+(?:\.\d+)?)%'            # 50% -> percent(50)
+    r'|(?P<fact>\d+)!'                      # 5! -> factorial(5)
+    r'|(?P<minus>(?<=[\d)])\s*-\s*(?=[\d(]))'  # 2 - 3 -> 2-3
+)
+
+def _preprocess_sub(match):
+    """Return the replacement for a single _PREPROC_RE match"""
+    kind = match.lastgroup
+    if kind == 'mul':
+        return '*'
+    if kind == 'mod':
+        return match.group(0)
+    if kind == 'pct':
+        return f"percent({match.group('pct')})"
+    if kind == 'fact':
+        return f"factorial({match.group('fact')})"
+    return '-'
+
 def preprocess_expression(expr: str) -> str:
     """Preprocess expression to handle various formats and conversions"""
     if not expr:
         return ""
     
-    # Remove any whitespace
-    expr = expr.strip()
-    
-    # Handle implied multiplication: 2(3) -> 2*(3), (2)(3) -> (2)*(3)
-    expr = re.sub(r'(\d)(\()', r'\1*\2', expr)
-    expr = re.sub(r'(\))(\()', r'\1*\2', expr)
-    expr = re.sub(r'(\))(\d)', r'\1*\2', expr)
-    expr = re.sub(r'(pi)(\d)', r'\1*\2', expr)
-    expr = re.sub(r'(e)(\d)', r'\1*\2', expr)
-    
-    # Handle percentage: 50% -> percent(50)
-    expr = re.sub(r'(\d+(?:\.\d+)?)%', r'percent(\1)', expr)
-    
-    # Replace ^ with ** for exponentiation
-    expr = expr.replace('^', '**')
-    
-    # Handle modulus: 10%3 -> mod(10, 3)
-    # This is complex because % is used for both percentage and modulus
-    # We'll handle modulus separately after percentage conversion
-    
-    # Handle factorial: 5! -> factorial(5)
-    expr = re.sub(r'(\d+)!', r'factorial(\1)', expr)
-    
-    # Handle implied multiplication with constants: 2pi -> 2*pi
-    expr = re.sub(r'(\d)(pi)', r'\1*\2', expr)
-    expr = re.sub(r'(\d)(e)', r'\1*\2', expr)
+    # Remove any whitespace and replace ^ with ** for exponentiation
+    expr = expr.strip().replace('^', '**')
     
-    # Handle negative numbers and subtraction properly
-    expr = re.sub(r'(\d|\))\s*-\s*(\d|\()', r'\1-\2', expr)
-    
-    return expr
+    # Implied multiplication, modulus, percentage, factorial and subtraction
+    # in one pass
+    return _PREPROC_RE.sub(_preprocess_sub, expr)
 
 def validate_expression(expr: str) -> tuple:
     """Validate expression before evaluation"""
@@ -143,39 +196,308 @@ def validate_expression(expr: str) -> tuple:
         return False, "Empty expression"
     
     # Check for division by zero patterns
-    if re.search(r'/0(?!\.\d)', expr) or re.search(r'/\([^)]*0[^)]*\)', expr):
+    if _DIV_ZERO_RE.search(expr):
         return False, "Division by zero"
     
     # Check for invalid factorial usage
-    if re.search(r'factorial\(-?\d*\.\d+\)', expr):
+    if _BAD_FACTORIAL_RE.search(expr):
         return False, "Factorial requires integer"
     
     # Check for valid characters (basic safety)
-    valid_chars = r'^[0-9+\-*/().\s^!%a-zA-Z_,]+$'
-    if not re.match(valid_chars, expr):
+    if expr.translate(_DELETE_VALID):
         return False, "Invalid characters in expression"
     
-    # Check for balanced parentheses
-    stack = []
+    # Check for balanced parentheses: counts first, then nesting order
+    if expr.count('(') != expr.count(')'):
+        return False, "Unbalanced parentheses"
+    
+    depth = 0
     for char in expr:
         if char == '(':
-            stack.append(char)
+            depth += 1
         elif char == ')':
-            if not stack:
+            depth -= 1
+            if depth < 0:
                 return False, "Unbalanced parentheses"
-            stack.pop()
-    
-    if stack:
-        return False, "Unbalanced parentheses"
     
     return True, ""
 
+# ---------------------------------------------------
+# Expression compiler (Shunting-Yard -> postfix program)
+# ---------------------------------------------------
+# A program is two parallel arrays run by a small stack machine: a bytes
+# object of opcodes and a tuple holding each opcode's argument. Constants and
+# functions are resolved from SAFE_ENV at compile time.
+OP_CONST = 0   # argument: the number to push
+OP_BINARY = 1  # argument: two-operand function (operator.add, ...)
+OP_UNARY = 2   # argument: one-operand function (operator.neg, ...)
+OP_CALL = 3    # argument: (function, argument count)
+
+_TOKEN_RE = re.compile(
+    r'\s*(?:(?P<num>\d+\.?\d*|\.\d+)|(?P<name>[A-Za-z_]\w*)|(?P<op>\*\*|//|[-+*/%(),]))'
+)
+
+# operator -> (precedence, right associative, function), following Python
+_BINARY_OPS = {
+    "+": (1, False, operator.add),
+    "-": (1, False, operator.sub),
+    "*": (2, False, operator.mul),
+    "/": (2, False, operator.truediv),
+    "//": (2, False, operator.floordiv),
+    "%": (2, False, operator.mod),
+    "**": (4, True, power),
+}
+_UNARY_OPS = {
+    "+": (3, True, operator.pos),
+    "-": (3, True, operator.neg),
+}
+
+def _tokenize(expr: str):
+    """Split a processed expression into (kind, text) tokens"""
+    tokens = []
+    pos = 0
+    end = len(expr.rstrip())
+    while pos < end:
+        match = _TOKEN_RE.match(expr, pos)
+        if not match:
+            raise SyntaxError(f"Unexpected character at {pos}")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        pos = match.end()
+    return tokens
+
+def _compile_postfix(expr: str) -> tuple:
+    """Compile a processed expression into an (opcodes, operands) program.
+
+    Raises SyntaxError for anything outside the supported grammar.
+    """
+    tokens = _tokenize(expr)
+    opcodes = []
+    operands = []
+    
+    def emit(op, arg):
+        opcodes.append(op)
+        operands.append(arg)
+    
+    # Operators are (precedence, right_assoc, opcode, func) tuples,
+    # parentheses are [func, arg_count] lists (func is None for grouping)
+    stack = []
+    expect_operand = True
+    
+    for i, (kind, text) in enumerate(tokens):
+        if kind == "num":
+            if not expect_operand:
+                raise SyntaxError("Missing operator")
+            if "." in text:
+                value = float(text)
+            elif text[0] == "0" and text.strip("0"):
+                raise SyntaxError("Leading zeros in integer literal")
+            else:
+                value = int(text)
+            emit(OP_CONST, value)
+            expect_operand = False
+        
+        elif kind == "name":
+            if not expect_operand or text not in SAFE_ENV:
+                raise SyntaxError(f"Unsupported name: {text}")
+            value = SAFE_ENV[text]
+            if i + 1 < len(tokens) and tokens[i + 1][1] == "(":
+                if not callable(value):
+                    raise SyntaxError(f"Not a function: {text}")
+                stack.append(value)  # marks the call; the paren replaces it
+            elif isinstance(value, (int, float)):
+                emit(OP_CONST, value)
+                expect_operand = False
+            else:
+                raise SyntaxError(f"Unsupported name: {text}")
+        
+        elif text == "(":
+            if not expect_operand:
+                raise SyntaxError("Missing operator")
+            func = stack.pop() if stack and callable(stack[-1]) else None
+            stack.append([func, 0])
+        
+        elif text == ")" or text == ",":
+            empty_call = (expect_operand and text == ")" and i > 0 and tokens[i - 1][1] == "("
+                          and isinstance(stack[-1], list) and stack[-1][0] is not None)
+            if expect_operand and not empty_call:
+                raise SyntaxError("Missing operand")
+            while stack and isinstance(stack[-1], tuple):
+                emit(*stack.pop()[2:])
+            if not stack:
+                raise SyntaxError("Unbalanced parentheses")
+            paren = stack[-1]
+            if text == ",":
+                if paren[0] is None:
+                    raise SyntaxError("Tuples are not supported")
+                paren[1] += 1
+                expect_operand = True
+                continue
+            stack.pop()
+            if paren[0] is not None:
+                arg_count = paren[1] if empty_call else paren[1] + 1
+                emit(OP_CALL, (paren[0], arg_count))
+            expect_operand = False
+        
+        elif expect_operand:
+            if text not in _UNARY_OPS:
+                raise SyntaxError("Missing operand")
+            prec, right, func = _UNARY_OPS[text]
+            stack.append((prec, right, OP_UNARY, func))
+        
+        else:
+            prec, right, func = _BINARY_OPS[text]
+            while (stack and isinstance(stack[-1], tuple)
+                   and (stack[-1][0] > prec or (stack[-1][0] == prec and not right))):
+                emit(*stack.pop()[2:])
+            stack.append((prec, right, OP_BINARY, func))
+            expect_operand = True
+    
+    if expect_operand:
+        raise SyntaxError("Missing operand")
+    while stack:
+        entry = stack.pop()
+        if not isinstance(entry, tuple):
+            raise SyntaxError("Unbalanced parentheses")
+        emit(*entry[2:])
+    return bytes(opcodes), tuple(operands)
+
+@functools.lru_cache(maxsize=4096)
+def parse_to_postfix(expr: str):
+    """Return the cached postfix program for expr, or None if unsupported"""
+    try:
+        return _compile_postfix(expr)
+    except SyntaxError:
+        return None
+
+def run_program(program: tuple):
+    """Execute a postfix program on a simple value stack"""
+    opcodes, operands = program
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    for op, arg in zip(opcodes, operands):
+        if op == OP_CONST:
+            push(arg)
+        elif op == OP_BINARY:
+            right = pop()
+            stack[-1] = arg(stack[-1], right)
+        elif op == OP_UNARY:
+            stack[-1] = arg(stack[-1])
+        else:
+            func, arg_count = arg
+            split = len(stack) - arg_count
+            args = stack[split:]
+            del stack[split:]
+            push(func(*args))
+    return stack[0]
+
+# ---------------------------------------------------
+# AST interpreter (fallback for the stack machine)
+# ---------------------------------------------------
+# Only these node types are evaluated; anything else is rejected
+_AST_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: power,
+}
+_AST_UNARY_OPS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+@functools.lru_cache(maxsize=4096)
+def _parse_ast(expr: str):
+    """Parse a processed expression once and reuse the tree"""
+    return ast.parse(expr, mode='eval')
+
+def _lookup_name(node):
+    """Resolve an ast.Name from SAFE_ENV"""
+    if node.id not in SAFE_ENV or node.id == "__builtins__":
+        raise NameError(f"name '{node.id}' is not defined", name=node.id)
+    return SAFE_ENV[node.id]
+
+def _eval_node(node):
+    """Evaluate a whitelisted expression node against SAFE_ENV"""
+    if isinstance(node, ast.Expression):
+        return _eval_node(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _AST_BINARY_OPS:
+        return _AST_BINARY_OPS[type(node.op)](_eval_node(node.left), _eval_node(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _AST_UNARY_OPS:
+        return _AST_UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    if isinstance(node, ast.Name):
+        # Outside call position only numeric constants are allowed
+        value = _lookup_name(node)
+        if type(value) not in (int, float):
+            raise SyntaxError(f"Not a number: {node.id}")
+        return value
+    if isinstance(node, ast.Call) and not node.keywords:
+        if isinstance(node.func, ast.Name):
+            func = _lookup_name(node.func)
+        else:
+            func = _eval_node(node.func)
+        return func(*[_eval_node(arg) for arg in node.args])
+    raise SyntaxError(f"Unsupported expression: {type(node).__name__}")
+
 # ---------------------------------------------------
 # Safe expression evaluation
 # ---------------------------------------------------
+def _normalize_result(result):
+    """Clean up floating point noise in an evaluation result"""
+    # Only real numbers can be returned (e.g. (-8)**(1/3) is complex)
+    if not isinstance(result, (int, float)):
+        raise ValueError("Result is not a real number")
+    
+    # Handle special cases
+    if isinstance(result, float):
+        # inf/nan have no JSON representation
+        if not math.isfinite(result):
+            raise ValueError("Result is not a finite number")
+        # Remove floating point errors for small numbers
+        if abs(result) < 1e-10:
+            result = 0.0
+        # Format to avoid scientific notation for large numbers
+        if abs(result) > 1e10 or (abs(result) < 1e-4 and result != 0):
+            return result  # Return as-is for scientific notation
+        # Round to avoid floating point precision issues
+        result = round(result, 10)
+    
+    return result
+
+# Fast path for a bare number or a single binary operation ("42", "2*3")
+_TRIVIAL_NUMBER = r'(-?(?:\d+\.\d+|0|[1-9]\d*))'
+_TRIVIAL_RE = re.compile(
+    rf'\s*{_TRIVIAL_NUMBER}\s*(?:([+\-*/])\s*{_TRIVIAL_NUMBER}\s*)?'
+)
+_TRIVIAL_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+def _parse_number(text: str):
+    return float(text) if "." in text else int(text)
+
 def safe_eval(expr: str):
     """Safely evaluate mathematical expression"""
     try:
+        trivial = _TRIVIAL_RE.fullmatch(expr)
+        if trivial:
+            left, op, right = trivial.groups()
+            result = _parse_number(left)
+            if op:
+                right = _parse_number(right)
+                if op == "/" and right == 0:
+                    raise ValueError("Division by zero")
+                result = _TRIVIAL_OPS[op](result, right)
+            return _normalize_result(result)
+        
         # Preprocess expression
         processed_expr = preprocess_expression(expr)
         
@@ -184,114 +506,128 @@ def safe_eval(expr: str):
         if not is_valid:
             raise ValueError(error_msg)
         
-        # Special handling for modulus before eval
-        # We need to handle a % b pattern after percentage conversion
-        processed_expr = re.sub(r'(\d+(?:\.\d+)?)%(\d+(?:\.\d+)?)', r'mod(\1, \2)', processed_expr)
-        
-        # Evaluate expression
-        result = eval(processed_expr, SAFE_ENV, {})
-        
-        # Handle special cases
-        if isinstance(result, float):
-            # Remove floating point errors for small numbers
-            if abs(result) < 1e-10:
-                result = 0.0
-            # Format to avoid scientific notation for large numbers
-            if abs(result) > 1e10 or (abs(result) < 1e-4 and result != 0):
-                return result  # Return as-is for scientific notation
-            # Round to avoid floating point precision issues
-            result = round(result, 10)
+        # Evaluate expression with the stack machine; anything outside its
+        # grammar falls back to the AST interpreter (trees are cached per expression)
+        program = parse_to_postfix(processed_expr)
+        if program is not None:
+            result = run_program(program)
+        else:
+            result = _eval_node(_parse_ast(processed_expr))
         
-        return result
+        return _normalize_result(result)
         
     except ZeroDivisionError:
         raise ValueError("Division by zero")
-    except ValueError as ve:
-        raise ve  # Re-raise validation errors
-    except Exception as e:
-        # Provide more helpful error messages
-        error_msg = str(e).lower()
-        if "factorial" in error_msg:
-            raise ValueError("Factorial requires non-negative integer")
-        elif "math domain" in error_msg:
-            raise ValueError("Math domain error (e.g., sqrt of negative)")
-        elif "invalid literal" in error_msg:
-            raise ValueError("Invalid number format")
-        elif "name" in error_msg and "is not defined" in error_msg:
-            # Extract the undefined name from error message
-            match = re.search(r"'([^']+)' is not defined", error_msg)
-            if match:
-                raise ValueError(f"Undefined function or variable: {match.group(1)}")
-            else:
-                raise ValueError("Invalid expression syntax")
-        else:
-            raise ValueError("Invalid expression")
+    except OverflowError:
+        raise ValueError("Number too large")
+    except RecursionError:
+        raise ValueError("Expression too deeply nested")
+    except NameError as e:
+        raise ValueError(f"Undefined function or variable: {e.name}")
+    except (TypeError, SyntaxError):
+        raise ValueError("Invalid expression syntax")
+
+@functools.lru_cache(maxsize=8192)
+def _evaluate_cached(expr: str):
+    """Evaluate and format an expression, memoizing successful results.
+
+    Failed evaluations raise and are therefore never cached.
+    """
+    result = safe_eval(expr)
+
+    # Format result
+    if isinstance(result, float):
+        # Check if it's an integer represented as float (e.g., 2.0)
+        if result.is_integer():
+            result = int(result)
+
+    return result
+
+# ---------------------------------------------------
+# JSON responses
+# ---------------------------------------------------
+def _dumps(obj) -> bytes:
+    """Serialize obj to JSON bytes, preferring orjson when installed"""
+    if _ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers wider than 64 bits
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+def _json(obj, status=200):
+    """Build a JSON response without going through jsonify"""
+    return Response(_dumps(obj), status=status, mimetype="application/json")
+
+# Static response bodies are serialized once at import time
+_HOME_JSON = _dumps({
+    "message": "Smart Calculator Backend Running!",
+    "version": "2.0",
+    "endpoints": {
+        "/api/evaluate": "POST - Evaluate expression",
+        "/api/functions": "GET - List available functions"
+    }
+})
 
 @app.route("/")
 def home():
-    return jsonify({
-        "message": "Smart Calculator Backend Running!",
-        "version": "2.0",
-        "endpoints": {
-            "/api/evaluate": "POST - Evaluate expression",
-            "/api/functions": "GET - List available functions"
-        }
-    })
+    return Response(_HOME_JSON, mimetype="application/json")
 
 # ---------------------------------------------------
 # /api/evaluate  → evaluate expression
 # ---------------------------------------------------
+_MAX_EXPR_LEN = 4096
+_MAX_PARENS = 64
+
 @app.route("/api/evaluate", methods=["POST"])
 def evaluate():
     try:
         data = request.get_json()
 
         if not data:
-            return jsonify({"error": "No data provided"}), 400
+            return _json({"error": "No data provided"}, 400)
             
         if "expression" not in data:
-            return jsonify({"error": "Expression missing"}), 400
+            return _json({"error": "Expression missing"}, 400)
 
         expr = data["expression"].strip()
         
         if not expr:
-            return jsonify({"error": "Empty expression"}), 400
+            return _json({"error": "Empty expression"}, 400)
         
-        result = safe_eval(expr)
+        # Bound the work (and cache memory) a single request can cost
+        if len(expr) > _MAX_EXPR_LEN:
+            return _json({"error": "Expression too long", "success": False}, 400)
         
-        # Format result
-        if isinstance(result, float):
-            # Check if it's an integer represented as float (e.g., 2.0)
-            if result.is_integer():
-                result = int(result)
+        if expr.count('(') > _MAX_PARENS:
+            return _json({"error": "Too many parentheses", "success": False}, 400)
         
-        return jsonify({
-            "expression": expr,
-            "result": result,
-            "success": True
-        })
+        result = _evaluate_cached(expr)
+        
+        # Only expression and result vary, so splice them into a fixed body
+        body = (b'{"expression":' + _dumps(expr) + b',"result":' + _dumps(result)
+                + b',"success":true}')
+        return Response(body, mimetype="application/json")
 
     except ValueError as ve:
-        return jsonify({
+        return _json({
             "error": str(ve),
             "success": False
-        }), 400
+        }, 400)
         
     except Exception as e:
-        # Don't expose traceback in production
-        app.logger.error(f"Evaluation error: {str(e)}\n{traceback.format_exc()}")
-        return jsonify({
+        # Don't expose traceback in production (only logged in debug)
+        app.logger.error("Evaluation error: %s", e, exc_info=app.debug)
+        return _json({
             "error": "Internal server error",
             "success": False
-        }), 500
+        }, 500)
 
 # ---------------------------------------------------
 # /api/functions  → list available functions
 # ---------------------------------------------------
-@app.route("/api/functions", methods=["GET"])
-def list_functions():
-    """Return list of available mathematical functions"""
-    functions = {
+_FUNCTIONS_JSON = _dumps({
+    "functions": {
         "basic_operations": ["+", "-", "*", "/", "^", "%", "!"],
         "trigonometric": ["sin", "cos", "tan", "asin", "acos", "atan"],
         "hyperbolic": ["sinh", "cosh", "tanh"],
@@ -301,57 +637,61 @@ def list_functions():
         "special": ["abs", "factorial", "mod"],
         "constants": ["pi", "e", "inf"],
         "conversion": ["degrees", "radians", "percent"]
-    }
-    
-    return jsonify({
-        "functions": functions,
-        "message": "Available mathematical functions"
-    })
+    },
+    "message": "Available mathematical functions"
+})
+
+@app.route("/api/functions", methods=["GET"])
+def list_functions():
+    """Return list of available mathematical functions"""
+    return Response(_FUNCTIONS_JSON, mimetype="application/json")
 
 # ---------------------------------------------------
 # /api/clear-history  → does not store anything in backend,
 # but provided for frontend integration
 # ---------------------------------------------------
+_CLEAR_HISTORY_JSON = _dumps({
+    "message": "History cleared (frontend only)",
+    "success": True
+})
+
 @app.route("/api/clear-history", methods=["POST"])
 def clear_history():
-    return jsonify({
-        "message": "History cleared (frontend only)",
-        "success": True
-    }), 200
+    return Response(_CLEAR_HISTORY_JSON, status=200, mimetype="application/json")
 
 # ---------------------------------------------------
 # /api/health  → health check endpoint
 # ---------------------------------------------------
+# Only the timestamp changes, so the rest of the body is prebuilt
+_HEALTH_JSON_PREFIX = b'{"status":"healthy","service":"Smart Calculator Backend","timestamp":"'
+
 @app.route("/api/health", methods=["GET"])
 def health_check():
-    return jsonify({
-        "status": "healthy",
-        "service": "Smart Calculator Backend",
-        "timestamp": datetime.datetime.now().isoformat()
-    }), 200
+    body = _HEALTH_JSON_PREFIX + datetime.datetime.now().isoformat().encode() + b'"}'
+    return Response(body, status=200, mimetype="application/json")
 
 # ---------------------------------------------------
 # Error handlers
 # ---------------------------------------------------
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({
+    return _json({
         "error": "Endpoint not found",
         "available_endpoints": ["/api/evaluate", "/api/functions", "/api/health"]
-    }), 404
+    }, 404)
 
 @app.errorhandler(405)
 def method_not_allowed(error):
-    return jsonify({
+    return _json({
         "error": "Method not allowed"
-    }), 405
+    }, 405)
 
 @app.errorhandler(500)
 def internal_error(error):
-    app.logger.error(f"Internal server error: {error}")
-    return jsonify({
+    app.logger.error("Internal server error: %s", error)
+    return _json({
         "error": "Internal server error"
-    }), 500
+    }, 500)
 
 # ---------------------------------------------------
 # Import datetime for health check
@@ -362,10 +702,13 @@ import datetime
 # Server start
 # ---------------------------------------------------
 if __name__ == "__main__":
+    host = os.environ.get("HOST", "127.0.0.1")
+    port = int(os.environ.get("PORT", 5000))
+    
     print("=" * 50)
     print("Smart Calculator Backend v2.0")
     print("=" * 50)
-    print(f"Server starting on: http://localhost:5000")
+    print(f"Server starting on: http://{host}:{port}")
     print(f"API endpoints:")
     print(f"  POST /api/evaluate  - Evaluate expressions")
     print(f"  GET  /api/functions - List available functions")
@@ -373,4 +716,5 @@ if __name__ == "__main__":
     print(f"  POST /api/clear-history - Clear history (frontend)")
     print("=" * 50)
     
-    app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+    # Development server only; see wsgi.py for production deployment
+    app.run(host=host, port=port, debug=os.environ.get("FLASK_DEBUG") == "1")
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""Tests for the Shunting-Yard compiler and stack machine in app.py"""
+import math
+import random
+
+import pytest
+
+import app
+
+
+def vm_eval(expr):
+    program = app.parse_to_postfix(expr)
+    assert program is not None, f"stack machine rejected {expr!r}"
+    return app.run_program(program)
+
+
+def ast_eval(expr):
+    return app._eval_node(app._parse_ast(expr))
+
+
+def outcome(func, expr):
+    """Result or exception type, with nan made comparable"""
+    try:
+        value = func(expr)
+    except Exception as e:
+        return ("error", type(e))
+    if isinstance(value, float) and math.isnan(value):
+        return ("nan",)
+    return ("ok", type(value), value)
+
+
+@pytest.mark.parametrize("expr, expected", [
+    ("-2**2", -4),
+    ("2**-1", 0.5),
+    ("2**-1**2", 0.5),
+    ("--5", 5),
+    ("2+3*4", 14),
+    ("(2+3)*4", 20),
+    ("7//2", 3),
+    ("7%3", 1),
+    ("2**3**2", 512),
+    ("round(2.567, 2)", 2.57),
+    ("pow(2, 10)", 1024.0),
+    ("sin(pi/2)", 1.0),
+    ("00", 0),
+    (".5+5.", 5.5),
+])
+def test_stack_machine_matches_python(expr, expected):
+    assert vm_eval(expr) == expected
+    assert vm_eval(expr) == eval(expr, app.SAFE_ENV, {})
+
+
+def test_empty_call_compiles_and_fails_at_runtime():
+    with pytest.raises(TypeError):
+        vm_eval("sin()")
+    with pytest.raises(ValueError, match="Invalid expression syntax"):
+        app.safe_eval("sin()")
+
+
+@pytest.mark.parametrize("expr", [
+    "(1,2)",    # tuples
+    "007",      # leading zeros in an integer literal
+    "pi(2)",    # non-callable name used as a call
+    "abs",      # function used as a value
+    "x+1",      # unknown name
+    "2 3",      # missing operator
+    "2+",       # missing operand
+    "(2",       # unbalanced parentheses
+])
+def test_stack_machine_rejects_unsupported_input(expr):
+    assert app.parse_to_postfix(expr) is None
+
+
+@pytest.mark.parametrize("expr", ["(1,2)", "007", "pi(2)", "abs"])
+def test_rejected_input_is_an_error(expr):
+    with pytest.raises(ValueError):
+        app.safe_eval(expr)
+
+
+def _random_expression(rng, depth=0):
+    roll = rng.random()
+    if depth > 4 or roll < 0.3:
+        return rng.choice(["0", "1", "2", "3", "0.5", "2.5", "10", "pi", "e"])
+    if roll < 0.45:
+        return rng.choice(["-", "+"]) + _random_expression(rng, depth + 1)
+    if roll < 0.55:
+        return "(" + _random_expression(rng, depth + 1) + ")"
+    if roll < 0.65:
+        func = rng.choice(["sin", "sqrt", "abs", "round", "pow", "mod", "log", "floor"])
+        args = [_random_expression(rng, depth + 1) for _ in range(rng.choice([0, 1, 1, 2]))]
+        return func + "(" + ", ".join(args) + ")"
+    op = rng.choice(["+", "-", "*", "/", "//", "%", "**"])
+    if op == "**":
+        # Keep exponents small so results stay cheap to compute
+        return _random_expression(rng, depth + 1) + op + rng.choice(["2", "-1", "0.5"])
+    return _random_expression(rng, depth + 1) + op + _random_expression(rng, depth + 1)
+
+
+def test_stack_machine_agrees_with_ast_fallback():
+    rng = random.Random(1234)
+    for _ in range(2000):
+        expr = _random_expression(rng)
+        assert app.parse_to_postfix(expr) is not None, expr
+        assert outcome(vm_eval, expr) == outcome(ast_eval, expr), expr
@@ -0,0 +1,34 @@
+"""Tests for expression preprocessing in app.py"""
+import pytest
+
+import app
+
+
+@pytest.mark.parametrize("compact, spaced", [
+    ("3*10%4", "3*10 % 4"),
+    ("10%4*3", "10 % 4*3"),
+    ("20/10%3", "20/10 % 3"),
+    ("20%7/2", "20 % 7/2"),
+    ("2^10%3", "2^10 % 3"),
+    ("10%3^2", "10 % 3^2"),
+    ("-5%2", "-5 % 2"),
+    ("1+7%4", "1+7 % 4"),
+])
+def test_modulus_precedence_does_not_depend_on_spacing(compact, spaced):
+    assert app.safe_eval(compact) == app.safe_eval(spaced)
+
+
+@pytest.mark.parametrize("expr, expected", [
+    ("50%", 0.5),
+    ("10%3", 1),
+    ("1.5%2", 1.5),
+    ("3*10%4", 2),
+    ("-5%2", 1),
+])
+def test_percent_and_modulus(expr, expected):
+    assert app.safe_eval(expr) == expected
+
+
+def test_modulus_is_left_as_binary_operator():
+    assert app.preprocess_expression("10%3") == "10%3"
+    assert app.preprocess_expression("50%") == "percent(50)"
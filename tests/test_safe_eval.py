@@ -0,0 +1,85 @@
+"""Tests for safe_eval in app.py"""
+import re
+
+import pytest
+
+import app
+
+
+@pytest.mark.parametrize("expr", ["9^9^9", "10^10^10", "2**10**10", "(-7)^9^9"])
+def test_power_tower_is_rejected(expr):
+    with pytest.raises(ValueError, match="Number too large"):
+        app.safe_eval(expr)
+
+
+def test_power_guard_applies_to_ast_fallback():
+    with pytest.raises(OverflowError):
+        app._eval_node(app._parse_ast("9**9**9"))
+
+
+@pytest.mark.parametrize("expr, expected", [
+    ("2^10", 1024),
+    ("10^100", 10 ** 100),
+    ("(-2)^3", -8),
+    ("2^-2", 0.25),
+    ("1^(10^100)", 1),
+])
+def test_power_within_limit(expr, expected):
+    assert app.safe_eval(expr) == expected
+
+
+@pytest.mark.parametrize("expr", ["(-8)^(1/3)", "(-1)**0.5"])
+def test_complex_result_is_rejected(expr):
+    with pytest.raises(ValueError, match="Result is not a real number"):
+        app.safe_eval(expr)
+
+
+@pytest.mark.parametrize("expr", ["inf", "inf-inf", "-inf"])
+def test_non_finite_result_is_rejected(expr):
+    with pytest.raises(ValueError, match="Result is not a finite number"):
+        app.safe_eval(expr)
+
+
+def test_complex_result_is_not_cached():
+    client = app.app.test_client()
+    for _ in range(2):
+        response = client.post("/api/evaluate", json={"expression": "(-8)^(1/3)"})
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "Result is not a real number"
+
+
+def _outcome(expr):
+    try:
+        return ("ok", app.safe_eval(expr))
+    except ValueError as e:
+        return ("error", str(e))
+
+
+@pytest.mark.parametrize("expr, uses_fast_path", [
+    ("42", True),
+    ("2 * 3", True),
+    ("2--3", True),
+    ("1/0", True),
+    ("1/0.0", True),
+    ("1.5*2", True),
+    ("007", False),
+])
+def test_trivial_fast_path_matches_full_pipeline(monkeypatch, expr, uses_fast_path):
+    assert bool(app._TRIVIAL_RE.fullmatch(expr)) == uses_fast_path
+    fast = _outcome(expr)
+    # A pattern that never matches forces the full pipeline
+    monkeypatch.setattr(app, "_TRIVIAL_RE", re.compile(r"(?!)"))
+    assert fast == _outcome(expr)
+
+
+@pytest.mark.parametrize("expr, expected", [
+    ("42", ("ok", 42)),
+    ("2 * 3", ("ok", 6)),
+    ("2--3", ("ok", 5)),
+    ("1/0", ("error", "Division by zero")),
+    ("1/0.0", ("error", "Division by zero")),
+    ("007", ("error", "Invalid expression syntax")),
+    ("1.5*2", ("ok", 3.0)),
+])
+def test_trivial_expressions(expr, expected):
+    assert _outcome(expr) == expected
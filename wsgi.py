@@ -0,0 +1,7 @@
+"""WSGI entry point for production servers.
+
+    gunicorn -k gevent -w $(nproc) wsgi:application
+"""
+from app import app
+
+application = app